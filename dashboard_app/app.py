@@ -4,18 +4,90 @@ import streamlit as st
 import pandas as pd
 from snowflake.snowpark import Session
 from snowflake.snowpark.functions import col
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import altair as alt
 import calendar
 import numpy as np 
+import queue
+import threading
  
 
 # —————————————————————————————————————————————————————
+# Snowpark session pool
+# Shared across all users of the app; each query borrows its own session.
+# One script run may hold at most `sessions_per_user` of them, so the pool
+# always has sessions left for other users while a slow page is loading.
+DEFAULT_SESSION_POOL_SIZE = 10
+DEFAULT_SESSIONS_PER_USER = 6
+SESSION_WAIT_SECONDS = 60
+
+class SessionPoolBusy(Exception):
+    pass
+
+def create_session():
+    return Session.builder.configs(dict(st.secrets["snowflake"])).create()
+
 @st.cache_resource
-def get_session():
-    creds = st.secrets["snowflake"]
-    return Session.builder.configs(creds).create()
+def get_session_pool():
+    size = max(1, int(st.secrets.get("session_pool_size", DEFAULT_SESSION_POOL_SIZE)))
+    pool = queue.Queue(maxsize=size)
+    # Slots start empty; sessions are created on first use
+    for _ in range(size):
+        pool.put(None)
+    return pool
+
+def sessions_per_user():
+    size = get_session_pool().maxsize
+    limit = max(1, int(st.secrets.get("sessions_per_user", DEFAULT_SESSIONS_PER_USER)))
+    # keep at least one session free for other users
+    return min(limit, size - 1) if size > 1 else 1
+
+@contextmanager
+def pooled_session():
+    pool = get_session_pool()
+    try:
+        session = pool.get(timeout=SESSION_WAIT_SECONDS)
+    except queue.Empty:
+        raise SessionPoolBusy(
+            f"All Snowflake sessions are busy (waited {SESSION_WAIT_SECONDS}s). Please try again shortly."
+        ) from None
+    try:
+        if session is None:
+            session = create_session()
+        yield session
+    except Exception:
+        # A failed query may mean a dead connection or expired token:
+        # drop the session so the next borrower gets a fresh one.
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+        session = None
+        raise
+    finally:
+        pool.put(session)
+
+def gather(tasks):
+    # Submit independent loaders at once and wait for all of them,
+    # so page latency tracks the slowest query rather than the sum.
+    ctx = get_script_run_ctx()
+
+    def run(fn, *args):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    workers = min(len(tasks), sessions_per_user())
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run, fn, *args) for fn, *args in tasks]
+        try:
+            return [f.result() for f in futures]
+        except SessionPoolBusy as e:
+            st.error(f"⏳ {e}")
+            st.stop()
 
-session = get_session()
 st.set_page_config(layout="wide")
 st.title("📊 E-Commerce Analytics Dashboard")
 st.markdown(
@@ -35,8 +107,12 @@ with st.expander("ℹ️ About this dashboard"):
 
 # —————————————————————————————————————————————————————
 # Sidebar Filters
-years = [r[0] for r in session.table("mart_sales_by_state_m_y").select("YEAR").distinct().order_by("YEAR").collect()]
-states = [r[0] for r in session.table("mart_sales_by_state_m_y").select("STATE_NAME").distinct().order_by("STATE_NAME").collect()]
+@st.cache_data(ttl=3600)
+def load_filter_values(column):
+    with pooled_session() as session:
+        return [r[0] for r in session.table("mart_sales_by_state_m_y").select(column).distinct().order_by(column).collect()]
+
+years, states = gather([(load_filter_values, "YEAR"), (load_filter_values, "STATE_NAME")])
 
 st.sidebar.header("Filters")
 selected_years = st.sidebar.multiselect("Year", years, default=years)
@@ -47,13 +123,14 @@ selected_states = st.sidebar.multiselect("State", states, default=states)
 # These functions load data from Snowflake 
 @st.cache_data(ttl=3600)
 def load_state_month(selected_years, selected_states):
-    df = (
-        session.table("mart_sales_by_state_m_y")
-        .filter(col("YEAR").isin(selected_years))
-        .filter(col("STATE_NAME").isin(selected_states))
-        .select("YEAR", "MONTH", "STATE_NAME", "TOTAL_REVENUE")
-        .to_pandas()
-    )
+    with pooled_session() as session:
+        df = (
+            session.table("mart_sales_by_state_m_y")
+            .filter(col("YEAR").isin(selected_years))
+            .filter(col("STATE_NAME").isin(selected_states))
+            .select("YEAR", "MONTH", "STATE_NAME", "TOTAL_REVENUE")
+            .to_pandas()
+        )
     df.columns = df.columns.str.lower()
     df["month"] = pd.to_numeric(df["month"], errors="coerce").fillna(1).astype(int)
     df["year"] = pd.to_numeric(df["year"], errors="coerce").fillna(0).astype(int)
@@ -62,12 +139,13 @@ def load_state_month(selected_years, selected_states):
 
 @st.cache_data(ttl=3600)
 def load_category_month(selected_years):
-    df = (
-        session.table("mart_sales_by_category_m_y")
-        .filter(col("YEAR").isin(selected_years))
-        .select("YEAR", "MONTH", "CATEGORY", "TOTAL_REVENUE")
-        .to_pandas()
-    )
+    with pooled_session() as session:
+        df = (
+            session.table("mart_sales_by_category_m_y")
+            .filter(col("YEAR").isin(selected_years))
+            .select("YEAR", "MONTH", "CATEGORY", "TOTAL_REVENUE", "ORDERS_COUNT")
+            .to_pandas()
+        )
     df.columns = df.columns.str.lower()
     df["month"] = pd.to_numeric(df["month"], errors="coerce").fillna(1).astype(int)
     df["year"] = pd.to_numeric(df["year"], errors="coerce").fillna(0).astype(int)
@@ -76,35 +154,49 @@ def load_category_month(selected_years):
 
 @st.cache_data(ttl=3600)
 def load_top_products(selected_years):
-    return (
-        session.table("mart_top_products")
-        .filter(col("YEAR").isin(selected_years))
-        .select("PRODUCT_KEY", "CATEGORY", "TOTAL_QUANTITY", "TOTAL_REVENUE")
-        .sort(col("TOTAL_REVENUE").desc())
-        .limit(10)
-        .to_pandas()
-        .rename(columns={"TOTAL_REVENUE": "total_sales", "TOTAL_QUANTITY": "total_quantity"})
-        .rename(columns=str.lower)
-    )
+    with pooled_session() as session:
+        return (
+            session.table("mart_top_products")
+            .filter(col("YEAR").isin(selected_years))
+            .select("PRODUCT_KEY", "CATEGORY", "TOTAL_QUANTITY", "TOTAL_REVENUE")
+            .sort(col("TOTAL_REVENUE").desc())
+            .limit(10)
+            .to_pandas()
+            .rename(columns={"TOTAL_REVENUE": "total_sales", "TOTAL_QUANTITY": "total_quantity"})
+            .rename(columns=str.lower)
+        )
 
 @st.cache_data(ttl=3600)
 def load_segments(selected_years):
-    return session.table("mart_customer_segment_metrics").filter(col("YEAR").isin(selected_years)).to_pandas().rename(columns=str.lower)
+    with pooled_session() as session:
+        return session.table("mart_customer_segment_metrics").filter(col("YEAR").isin(selected_years)).to_pandas().rename(columns=str.lower)
 
 @st.cache_data(ttl=3600)
-def load_cohorts(selected_years):
-    df = session.table("mart_cohort_retention").to_pandas()
+def load_cohorts_all():
+    with pooled_session() as session:
+        df = session.table("mart_cohort_retention").to_pandas()
     df.columns = df.columns.str.lower()
     df["cohort_month"] = pd.to_datetime(df["cohort_month"])
-    return df[df["cohort_year"].isin(selected_years)]
+    return df
+
+@st.cache_data(ttl=3600)
+def load_revenue_vs_income():
+    with pooled_session() as session:
+        df = session.table("mart_revenue_vs_income_state_year").to_pandas()
+    df.columns = df.columns.str.lower()
+    return df
 
 # —————————————————————————————————————————————————————
-# Load Data
-df_state = load_state_month(selected_years, selected_states)
-df_cat = load_category_month(selected_years)
-df_top = load_top_products(selected_years)
-df_segments = load_segments(selected_years)
-df_cohort = load_cohorts(selected_years)
+# Load Data (marts are independent, so they are fetched in parallel)
+df_state, df_cat, df_top, df_segments, df_cohort_all, df_mart = gather([
+    (load_state_month, selected_years, selected_states),
+    (load_category_month, selected_years),
+    (load_top_products, selected_years),
+    (load_segments, selected_years),
+    (load_cohorts_all,),
+    (load_revenue_vs_income,),
+])
+df_cohort = df_cohort_all[df_cohort_all["cohort_year"].isin(selected_years)]
 
 # —————————————————————————————————————————————————————
 # Layout Tabs
@@ -264,15 +356,8 @@ with tab2:
     st.subheader("🏷️ Top Categories by Yearly Sales")
     st.caption("Note: Sales from years with incomplete data (e.g., 2023–2024) are included but may skew results.")
 
-    # Load filtered category data
-    df_cat = (
-        session.table("mart_sales_by_category_m_y")
-        .filter(col("YEAR").isin(selected_years))
-        .select("YEAR", "MONTH", "CATEGORY", "TOTAL_REVENUE", "ORDERS_COUNT")
-        .to_pandas()
-    )
-
-    df_cat.columns = df_cat.columns.str.upper()
+    # Filtered category data (loaded above)
+    df_cat = df_cat.rename(columns=str.upper)
 
     # Top N filter in-tab
     top_n_tab = st.slider("Top N Categories", min_value=3, max_value=15, value=6)
@@ -481,11 +566,8 @@ with tab4:
     This helps visualize how many users return after 1, 2, 3... months.
     """)
 
-    # ——— Load data ———
-    df_cohort = session.table("mart_cohort_retention").to_pandas()
-    df_cohort.columns = [col.lower() for col in df_cohort.columns]
-
-    df_cohort["cohort_month"] = pd.to_datetime(df_cohort["cohort_month"])
+    # ——— Data (all cohorts, loaded above) ———
+    df_cohort = df_cohort_all.copy()
     df_cohort["cohort_label"] = df_cohort["cohort_month"].dt.strftime("%Y-%m")
 
     # ——— Filters ———
@@ -594,9 +676,7 @@ This tab explores the relationship between **median household income** and **con
 ⚠️ **Note:** Data for **2023 and 2024** is **incomplete** and do not reflect full-year values.
 """)
 
-    # Load data from mart_revenue_vs_income_state_year
-    df_mart = session.table("mart_revenue_vs_income_state_year").to_pandas()
-    df_mart.columns = [col.lower() for col in df_mart.columns]
+    # Data from mart_revenue_vs_income_state_year (loaded above)
 
     # ——— Year Filter ———
     unique_years = sorted(df_mart["year"].dropna().unique())
@@ -0,0 +1,155 @@
+{#
+  Audit trail for data-quality runs. `dq_log_test_results` is wired as an
+  on-run-end hook for `dbt test` / `dbt build`: it prints per-test timing
+  (slowest first) with the number of checks and the date range each test
+  scanned, and records each result in `dq_test_runs`, including the date
+  watermark of models whose `column_checks` passed. `dq_scan_start` turns
+  that watermark back into the first date an incremental run scans.
+
+  Timing is per test node; checks merged into one `column_checks` scan share
+  a single timing.
+#}
+
+{% macro dq_audit_relation() %}
+  {{ return(api.Relation.create(database=target.database, schema=target.schema, identifier='dq_test_runs')) }}
+{% endmacro %}
+
+
+{% macro dq_watermark(model_name) %}
+  {%- if not execute -%}
+    {{ return(none) }}
+  {%- endif -%}
+
+  {%- set audit = adapter.get_relation(database=target.database, schema=target.schema, identifier='dq_test_runs') -%}
+  {%- if audit is none -%}
+    {{ return(none) }}
+  {%- endif -%}
+
+  {%- set result = run_query(
+    "select max(watermark) from " ~ audit ~
+    " where lower(model_name) = lower('" ~ model_name ~ "') and status = 'pass'"
+  ) -%}
+  {{ return(result.columns[0].values()[0]) }}
+{% endmacro %}
+
+
+{#- First date an incremental column_checks run scans, or none for a full scan -#}
+{% macro dq_scan_start(model_name, date_column, unique=[], unique_combination=[], verbose=false) %}
+  {%- if date_column is none or var('dq_mode', 'full') != 'incremental' -%}
+    {{ return(none) }}
+  {%- endif -%}
+
+  {#- a date slice only keeps uniqueness exact when the date is part of the key -#}
+  {%- set slice_safe = (unique | reject('equalto', date_column) | list | length == 0)
+      and (not unique_combination or date_column in unique_combination) -%}
+  {%- if not slice_safe -%}
+    {%- if verbose -%}
+      {%- do log('column_checks: unique keys on ' ~ model_name ~ ' do not include ' ~ date_column ~ ', running full scan', info=True) -%}
+    {%- endif -%}
+    {{ return(none) }}
+  {%- endif -%}
+
+  {%- set since = dq_watermark(model_name) -%}
+  {%- if since is none -%}
+    {{ return(none) }}
+  {%- endif -%}
+  {{ return(since - modules.datetime.timedelta(days=var('dq_lookback_days', 3))) }}
+{% endmacro %}
+
+
+{% macro dq_check_count(kwargs) %}
+  {{ return(
+    kwargs.get('not_null', []) | length
+    + kwargs.get('unique', []) | length
+    + (1 if kwargs.get('unique_combination') else 0)
+    + kwargs.get('accepted_values', {}) | length
+    + kwargs.get('expressions', {}) | length
+  ) }}
+{% endmacro %}
+
+
+{% macro dq_log_test_results(results) %}
+  {%- if not execute or flags.WHICH not in ('test', 'build') -%}
+    {{ return('') }}
+  {%- endif -%}
+
+  {%- set test_results = [] -%}
+  {%- for res in results if res.node.resource_type == 'test' -%}
+    {%- do test_results.append(res) -%}
+  {%- endfor -%}
+  {%- if not test_results -%}
+    {{ return('') }}
+  {%- endif -%}
+
+  {%- set audit = dq_audit_relation() -%}
+  {%- do run_query(
+    "create table if not exists " ~ audit ~ " (
+      run_started_at  timestamp_ntz,
+      invocation_id   varchar,
+      dq_mode         varchar,
+      test_name       varchar,
+      model_name      varchar,
+      status          varchar,
+      failures        integer,
+      execution_time  float,
+      scanned_from    date,
+      watermark       date
+    )"
+  ) -%}
+
+  {%- do log('Data-quality test timing (slowest first):', info=True) -%}
+
+  {%- set rows = [] -%}
+  {%- for res in test_results | sort(attribute='execution_time', reverse=true) -%}
+    {%- set node = res.node -%}
+    {%- set status = res.status | string -%}
+    {%- set parent = graph.nodes.get(node.depends_on.nodes[0]) if node.depends_on.nodes else none -%}
+    {%- set model_name = parent.alias if parent else none -%}
+    {%- set metadata = node.test_metadata if node.test_metadata is defined else none -%}
+    {%- set is_column_checks = metadata and metadata.name == 'column_checks' and parent -%}
+    {%- set date_column = metadata.kwargs.get('date_column') if is_column_checks else none -%}
+
+    {%- set checks = dq_check_count(metadata.kwargs) if is_column_checks else 1 -%}
+    {%- set scanned_from = none -%}
+    {%- if date_column -%}
+      {%- set scanned_from = dq_scan_start(
+        model_name, date_column,
+        metadata.kwargs.get('unique', []), metadata.kwargs.get('unique_combination', [])
+      ) -%}
+    {%- endif -%}
+
+    {#- advance the watermark only for column_checks that passed, reading
+        only the scanned slice; a full scan of a view would redo its logic -#}
+    {%- set watermark = none -%}
+    {%- if date_column and status == 'pass'
+          and (scanned_from is not none or parent.config.materialized != 'view') -%}
+      {%- set relation = api.Relation.create(database=parent.database, schema=parent.schema, identifier=parent.alias) -%}
+      {%- set result = run_query(
+        "select max(" ~ date_column ~ ") from " ~ relation
+        ~ (" where " ~ date_column ~ " >= '" ~ scanned_from ~ "'::date" if scanned_from is not none else "")
+      ) -%}
+      {%- set watermark = result.columns[0].values()[0] -%}
+    {%- endif -%}
+
+    {%- set scan_range = ('full' if not date_column else
+                          ('full' if scanned_from is none else scanned_from ~ '..')) -%}
+    {%- do log('  ' ~ '%-70s %8.2fs  %-5s  %2d checks  scanned %s' | format(
+      node.name, res.execution_time, status, checks, scan_range), info=True) -%}
+
+    {%- do rows.append(
+      "('" ~ run_started_at.strftime('%Y-%m-%d %H:%M:%S') ~ "'::timestamp_ntz, "
+      ~ "'" ~ invocation_id ~ "', "
+      ~ "'" ~ var('dq_mode', 'full') ~ "', "
+      ~ "'" ~ node.name ~ "', "
+      ~ ("'" ~ model_name ~ "'" if model_name else 'null') ~ ", "
+      ~ "'" ~ status ~ "', "
+      ~ (res.failures if res.failures is not none else 'null') ~ ", "
+      ~ res.execution_time ~ ", "
+      ~ ("'" ~ scanned_from ~ "'::date" if scanned_from is not none else 'null') ~ ", "
+      ~ ("'" ~ watermark ~ "'::date" if watermark is not none else 'null') ~ ")"
+    ) -%}
+  {%- endfor -%}
+
+  {%- do run_query("insert into " ~ audit ~ " values " ~ rows | join(', ')) -%}
+  {{ return('') }}
+{% endmacro %}
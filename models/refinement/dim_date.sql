@@ -4,7 +4,7 @@ with bounds as (
   select
     min(order_date) as start_date,
     max(order_date) as end_date
-  from {{ ref('ref_orders_enriched') }}
+  from {{ ref('ref_orders_prep') }}
 ),
 
 calendar as (
@@ -2,11 +2,11 @@
 
 with raw_products as (
   select
-    coalesce(product_key,'UNKNOWN') as product_key,
+    coalesce(product_code,'UNKNOWN') as product_key,
     title,
     category,
     case when lower(title) like '%gift card%' then true else false end as is_gift_card
-  from {{ ref('ref_orders_enriched') }}
+  from {{ ref('stg_amazon_purchases') }}
 ),
 
 -- count how often each (key, title, category, flag) appears
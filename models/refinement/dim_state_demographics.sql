@@ -1,12 +1,25 @@
 {{ config(materialized='table') }}
 
+-- state/year pairs that actually occur in orders
+with order_states as (
+  select distinct
+    final_fips,
+    order_year
+  from {{ ref('ref_orders_prep') }}
+  where final_fips is not null
+)
+
 select distinct
-  final_fips                     as state_fips,
-  final_state_name              as state_name,
-  order_year                    as survey_year,
-  median_household_income,
-  total_population
-from {{ ref('ref_orders_enriched') }}
-where final_fips is not null
-  and median_household_income is not null
-  and total_population is not null
+  o.final_fips                  as state_fips,
+  s.state_name,
+  o.order_year                  as survey_year,
+  d.median_household_income,
+  d.total_population
+from order_states o
+join {{ ref('stg_state_codes') }} s
+  on o.final_fips = s.state_fips
+join {{ ref('stg_state_demographics') }} d
+  on o.final_fips = d.state_fips
+ and o.order_year = d.survey_year
+where d.median_household_income is not null
+  and d.total_population is not null
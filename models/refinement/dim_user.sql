@@ -1,16 +1,24 @@
 {{ config(materialized='table') }}
 
+-- one row per ordering user; demographics looked up from the survey
+with ordering_users as (
+  select distinct survey_responseid
+  from {{ ref('ref_orders_prep') }}
+)
+
 select distinct
-  survey_responseid      as user_key,
-  age_group,
-  is_hispanic,
-  race,
-  education,
-  income_bracket,
-  gender,
-  sexual_orientation,
-  user_state_name        as home_state_name,
-  accounts_shared_cat,
-  household_size_cat,
-  purchase_frequency
-from {{ ref('ref_orders_enriched') }}
+  o.survey_responseid    as user_key,
+  u.age_group,
+  u.is_hispanic,
+  u.race,
+  u.education,
+  u.income_bracket,
+  u.gender,
+  u.sexual_orientation,
+  u.state                as home_state_name,
+  u.accounts_shared_cat,
+  u.household_size_cat,
+  u.purchase_frequency
+from ordering_users o
+left join {{ ref('stg_survey') }} u
+  on o.survey_responseid = u.survey_responseid
@@ -9,7 +9,7 @@ with enriched as (
     quantity,
     unit_price,
     order_value
-  from {{ ref('ref_orders_enriched') }}
+  from {{ ref('ref_orders_prep') }}
 )
 
 select * from enriched
@@ -1,4 +1,8 @@
-{{ config(materialized='table') }}
+{{ config(materialized='view') }}
+
+-- Wide, ad-hoc view of orders with every user & state attribute.
+-- Not used by the star schema: fct_orders/dims build from the narrow
+-- ref_orders_prep and the staged lookups instead.
 
 with
 
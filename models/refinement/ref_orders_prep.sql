@@ -0,0 +1,51 @@
+{{ config(materialized='table') }}
+
+with
+
+-- Base staged orders: only the keys and measures the fact needs
+orders as (
+  select
+    survey_responseid,
+    order_date,
+    order_year,
+    state as shipping_postal,
+    coalesce(product_code, 'UNKNOWN') as product_key,
+    quantity,
+    unit_price
+  from {{ ref('stg_amazon_purchases') }}
+),
+
+-- Staged state codes: postal_code → state_fips
+state_codes as (
+  select
+    postal_code,
+    state_fips
+  from {{ ref('stg_state_codes') }}
+),
+
+home_state as (
+  select * from {{ ref('ref_user_home_state') }}
+)
+
+select
+  o.survey_responseid,
+  o.order_date,
+  o.order_year,
+  o.product_key,
+
+  -- final unified key: shipping state, else user's home state
+  coalesce(s_ship.state_fips, h.home_fips) as final_fips,
+
+  o.quantity,
+  o.unit_price,
+
+  -- business metric
+  (o.unit_price * o.quantity)              as order_value
+
+from orders o
+
+left join state_codes s_ship
+  on o.shipping_postal = s_ship.postal_code
+
+left join home_state h
+  on o.survey_responseid = h.survey_responseid
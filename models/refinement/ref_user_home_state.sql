@@ -0,0 +1,10 @@
+{{ config(materialized='ephemeral') }}
+
+-- Survey respondent → home state keys (one row per user)
+select
+  u.survey_responseid,
+  s.postal_code  as home_postal,
+  s.state_fips   as home_fips
+from {{ ref('stg_survey') }} u
+left join {{ ref('stg_state_codes') }} s
+  on u.state = s.state_name
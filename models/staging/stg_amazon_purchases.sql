@@ -1,4 +1,6 @@
-{{ config(materialized='view') }}
+-- Materialized once so the dedup window isn't recomputed by every consumer
+-- (ref_orders_prep, dim_product); clustered for date-sliced scans.
+{{ config(materialized='table', cluster_by=['order_date']) }}
 
 with raw as (
   select
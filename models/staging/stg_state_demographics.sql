@@ -3,21 +3,14 @@
 with raw as (
   select
     survey_year,
-    json_payload
+    state_name,
+    median_household_income,
+    total_population,
+    -- two-digit code stored as text, leading zeros preserved
+    nullif(state_fips, '') as state_fips
   from {{ source('raw_data','raw_state_demographics') }}
 ),
 
-parsed as (
-  select
-    survey_year,
-    json_payload[0]::string  as state_name,
-    json_payload[1]::integer as median_household_income,
-    json_payload[2]::integer as total_population,
-    -- PRESERVE the two-digit code exactly as in the JSON
-    nullif(json_payload[3]::string, '') as state_fips
-  from raw
-),
-
 clean as (
   select
     survey_year,
@@ -25,7 +18,7 @@ clean as (
     median_household_income,
     total_population,
     state_fips
-  from parsed
+  from raw
   where state_fips is not null
     and median_household_income >= 0
     and total_population > 0
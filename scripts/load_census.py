@@ -4,7 +4,7 @@ import requests
 import snowflake.connector
 from dotenv import load_dotenv
 
-# Load credentials from .env 
+# Load credentials from .env
 load_dotenv()
 
 ctx = snowflake.connector.connect(
@@ -16,18 +16,78 @@ ctx = snowflake.connector.connect(
     schema=os.getenv("SNOWFLAKE_SCHEMA")
 )
 
+# Keep the raw API row as an audit column (off by default)
+KEEP_RAW_JSON = os.getenv("CENSUS_KEEP_RAW_JSON", "false").lower() in ("1", "true", "yes")
+
 cs = ctx.cursor()
-insert_sql = "INSERT INTO raw_data.state_demographics_raw(survey_year, json_payload) SELECT %s, PARSE_JSON(%s)"
+
+# Rows are batched into a temp table first (PARSE_JSON isn't allowed in a
+# multi-row VALUES insert), then the fetched years are replaced in the source.
+cs.execute("""
+    CREATE OR REPLACE TEMPORARY TABLE census_batch (
+        state_fips               VARCHAR(2),
+        survey_year              INT,
+        state_name               VARCHAR,
+        median_household_income  INT,
+        total_population         INT,
+        json_payload             VARCHAR
+    )
+""")
+batch_sql = "INSERT INTO census_batch VALUES (%s, %s, %s, %s, %s, %s)"
 
 YEARS = [2018, 2019, 2020, 2021, 2022, 2023]
 FIELDS = "NAME,B19013_001E,B01003_001E"
 
+# API header name → landing column
+COLUMNS = {
+    "state": "state_fips",
+    "NAME": "state_name",
+    "B19013_001E": "median_household_income",
+    "B01003_001E": "total_population",
+}
+
+
+def to_int(value):
+    return int(value) if value not in (None, "") else None
+
+
 for year in YEARS:
     url = f"https://api.census.gov/data/{year}/acs/acs5?get={FIELDS}&for=state:*"
-    data = requests.get(url).json()
-    for row in data[1:]:
-        cs.execute(insert_sql, [year, json.dumps(row)])
+    resp = requests.get(url)
+    resp.raise_for_status()
+    data = resp.json()
+
+    # Map fields by header name so a column reorder can't shift values
+    header = data[0]
+    missing = [name for name in COLUMNS if name not in header]
+    if missing:
+        raise ValueError(f"Census {year} response is missing fields {missing}; got header {header}")
+    idx = {COLUMNS[name]: header.index(name) for name in COLUMNS}
+
+    cs.executemany(batch_sql, [
+        (
+            row[idx["state_fips"]],
+            year,
+            row[idx["state_name"]],
+            to_int(row[idx["median_household_income"]]),
+            to_int(row[idx["total_population"]]),
+            json.dumps(dict(zip(header, row))) if KEEP_RAW_JSON else None,
+        )
+        for row in data[1:]
+    ])
 
-ctx.commit()
+# Replace the loaded years in one transaction so reruns don't duplicate rows
+cs.execute("BEGIN")
+cs.execute("""
+    DELETE FROM raw_data.raw_state_demographics
+    WHERE survey_year IN (SELECT DISTINCT survey_year FROM census_batch)
+""")
+cs.execute("""
+    INSERT INTO raw_data.raw_state_demographics
+        (state_fips, survey_year, state_name, median_household_income, total_population, json_payload)
+    SELECT state_fips, survey_year, state_name, median_household_income, total_population, PARSE_JSON(json_payload)
+    FROM census_batch
+""")
+cs.execute("COMMIT")
 cs.close()
-ctx.close()
\ No newline at end of file
+ctx.close()
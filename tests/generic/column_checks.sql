@@ -0,0 +1,72 @@
+{#
+  Runs every column check for a model in one aggregated scan instead of
+  one full-table query per not_null / unique / accepted_values test.
+
+  With `--vars '{dq_mode: incremental}'` and a `date_column`, only rows
+  from the last passing run's watermark (minus `dq_lookback_days`) are
+  scanned. Models with no recorded watermark fall back to a full scan.
+
+  The watermark is the newest business date seen, not a load marker:
+  backfills or corrections to rows older than the lookback window are
+  not re-validated in incremental mode. Run with `dq_mode: full` after
+  such loads; the on-run-end log shows the date range each test scanned.
+#}
+{% test column_checks(model, not_null=[], unique=[], unique_combination=[], accepted_values={}, expressions={}, date_column=none) %}
+
+{{ config(fail_calc='coalesce(sum(failures), 0)') }}
+
+{%- set checks = [] -%}
+
+{%- for column in not_null -%}
+  {%- do checks.append(('not_null(' ~ column ~ ')', 'count_if(' ~ column ~ ' is null)')) -%}
+{%- endfor -%}
+
+{%- for column in unique -%}
+  {%- do checks.append(('unique(' ~ column ~ ')', 'count(' ~ column ~ ') - count(distinct ' ~ column ~ ')')) -%}
+{%- endfor -%}
+
+{%- if unique_combination -%}
+  {%- set combo = unique_combination | join(', ') -%}
+  {%- do checks.append(('unique_combination(' ~ combo ~ ')', 'count(*) - count(distinct hash(' ~ combo ~ '))')) -%}
+{%- endif -%}
+
+{%- for column, values in accepted_values.items() -%}
+  {%- set value_list = [] -%}
+  {%- for value in values -%}{%- do value_list.append("'" ~ value ~ "'") -%}{%- endfor -%}
+  {%- do checks.append(('accepted_values(' ~ column ~ ')', 'count_if(' ~ column ~ ' is not null and ' ~ column ~ ' not in (' ~ value_list | join(', ') ~ '))')) -%}
+{%- endfor -%}
+
+{%- for column, expression in expressions.items() -%}
+  {%- do checks.append(('expression(' ~ column ~ ' ' ~ expression ~ ')', 'count_if(not (' ~ column ~ ' ' ~ expression ~ '))')) -%}
+{%- endfor -%}
+
+{%- set scan_start = dq_scan_start(model.identifier, date_column, unique, unique_combination, verbose=true) -%}
+
+with scoped as (
+  select * from {{ model }}
+  {%- if scan_start is not none %}
+  where {{ date_column }} >= '{{ scan_start }}'::date
+  {%- endif %}
+),
+
+totals as (
+  select
+  {%- for name, expression in checks %}
+    {{ expression }} as check_{{ loop.index }}{{ ',' if not loop.last }}
+  {%- endfor %}
+  from scoped
+),
+
+results as (
+  {%- for name, expression in checks %}
+  select '{{ name }}' as check_name, check_{{ loop.index }} as failures from totals
+  {%- if not loop.last %}
+  union all
+  {%- endif %}
+  {%- endfor %}
+)
+
+select * from results
+where failures > 0
+
+{% endtest %}